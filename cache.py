@@ -2,111 +2,281 @@
 Caching system for Mail.tm Console Client
 """
 
+import atexit
+import heapq
 import json
+import mmap
+import os
+import random
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
 from config import config
 from logger import logger
 
+# Cache entries are stored as compact [value, expires, created] lists, with
+# timestamps as whole epoch seconds, optionally followed by a dict of HTTP
+# validators (etag / last_modified) used to revalidate the entry
+VALUE, EXPIRES, CREATED, VALIDATORS = 0, 1, 2, 3
+
 
 class Cache:
     """Simple file-based cache with TTL support"""
     
+    # Minimum number of seconds between two writes of the cache file
+    FLUSH_INTERVAL = 5
+    # Probability that a set() also sweeps expired entries
+    CLEANUP_PROBABILITY = 0.01
+    # Cache files larger than this are memory-mapped when loading
+    MMAP_THRESHOLD = 64 * 1024
+    
     def __init__(self, cache_file: str = None):
         self.cache_file = Path(cache_file or config.get('cache_file', '~/.pryvon/cache.json')).expanduser()
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache: Dict[str, List[Any]] = {}
+        # Min-heap of (expires, key); records for overwritten or deleted keys are skipped when popped.
+        # None until the first sweep after loading, which builds it.
+        self._expiry_heap: Optional[List[Tuple[int, str]]] = []
+        self._dirty = False
+        self._last_flush = 0
+        self._last_written_bytes: Optional[int] = None
+        # Guards entries and the expiry heap, which the UI, client pool and push threads all touch.
+        # Reentrant because set() sweeps and flushes while holding it.
+        self._lock = threading.RLock()
+        
+        # Snapshot hot-path settings; refreshed by the config change listener
+        self._enabled = config.get('cache_enabled', True)
+        self._default_ttl = config.get('cache_ttl', 300)
+        config.register_listener(self._on_config_change)
+        
         self.load_cache()
+        
+        # Persist any pending mutations on interpreter shutdown
+        atexit.register(lambda: self._maybe_flush(force=True))
     
     def load_cache(self):
         """Load cache from file"""
         try:
             if self.cache_file.exists():
-                with open(self.cache_file, 'r') as f:
-                    self.cache = json.load(f)
-                # Clean expired entries
-                self._cleanup()
+                if orjson is not None:
+                    if self.cache_file.stat().st_size > self.MMAP_THRESHOLD:
+                        # Parse straight from the mapped pages instead of copying into a bytes object
+                        with open(self.cache_file, 'rb') as f, \
+                                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                                memoryview(mm) as view:
+                            self.cache = orjson.loads(view)
+                    else:
+                        self.cache = orjson.loads(self.cache_file.read_bytes())
+                else:
+                    with open(self.cache_file, 'r') as f:
+                        self.cache = json.load(f)
+                self._upgrade_entries()
+                self._expiry_heap = None
         except Exception as e:
             logger.warning(f"Could not load cache: {e}")
             self.cache = {}
     
-    def save_cache(self):
-        """Save cache to file"""
-        try:
-            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-        except Exception as e:
-            logger.warning(f"Could not save cache: {e}")
+    def _upgrade_entries(self):
+        """Convert entries written in the legacy dict format to lists"""
+        for key, entry in self.cache.items():
+            if isinstance(entry, dict):
+                self.cache[key] = [entry.get('value'), int(entry.get('expires', 0)), int(entry.get('created', 0))]
+                self._dirty = True
+    
+    def _on_config_change(self, key: str, value: Any):
+        """Refresh snapshotted settings when the configuration changes"""
+        if key == 'cache_enabled':
+            self._enabled = value
+        elif key == 'cache_ttl':
+            self._default_ttl = value
+    
+    def _flush_now(self):
+        """Write the cache to file immediately"""
+        with self._lock:
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                if orjson is not None:
+                    payload = orjson.dumps(self.cache)
+                else:
+                    payload = json.dumps(self.cache, separators=(',', ':')).encode()
+            
+                # Write to a temporary file and swap it in so a crash never leaves a partial cache
+                tmp_file = self.cache_file.with_suffix('.tmp')
+                tmp_file.write_bytes(payload)
+                os.replace(tmp_file, self.cache_file)
+                self._last_written_bytes = len(payload)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Could not save cache: {e}")
+            finally:
+                self._last_flush = time.time()
+    
+    def _maybe_flush(self, force: bool = False):
+        """Write the cache to file if dirty and the flush interval has elapsed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            if force or time.time() - self._last_flush >= self.FLUSH_INTERVAL:
+                self._flush_now()
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get value from cache if not expired"""
-        if not config.get('cache_enabled', True):
+        with self._lock:
+            if not self._enabled:
+                return default
+            
+            if key in self.cache:
+                entry = self.cache[key]
+                if int(time.time()) < entry[EXPIRES]:
+                    return entry[VALUE]
+                elif len(entry) <= VALIDATORS:
+                    # Remove expired entry; it is persisted with the next flush. Entries with
+                    # validators are kept until the next sweep so they can still be revalidated.
+                    del self.cache[key]
+                    self._dirty = True
+            
             return default
-        
-        if key in self.cache:
-            entry = self.cache[key]
-            if time.time() < entry.get('expires', 0):
-                return entry.get('value')
-            else:
-                # Remove expired entry
-                del self.cache[key]
-                self.save_cache()
-        
-        return default
     
-    def set(self, key: str, value: Any, ttl: int = None):
-        """Set value in cache with TTL"""
-        if not config.get('cache_enabled', True):
-            return
-        
-        ttl = ttl or config.get('cache_ttl', 300)
-        self.cache[key] = {
-            'value': value,
-            'expires': time.time() + ttl,
-            'created': time.time()
-        }
-        self.save_cache()
+    def peek(self, key: str) -> Tuple[Any, Optional[Dict[str, str]]]:
+        """Get (value, validators) for key even if it has expired, or (None, None) if missing"""
+        with self._lock:
+            entry = self.cache.get(key) if self._enabled else None
+            if entry is None:
+                return None, None
+            return entry[VALUE], entry[VALIDATORS] if len(entry) > VALIDATORS else None
+    
+    def touch(self, key: str, ttl: int = None) -> bool:
+        """Give key a fresh TTL without changing its value; returns False if it is missing"""
+        with self._lock:
+            entry = self.cache.get(key) if self._enabled else None
+            if entry is None:
+                return False
+            
+            entry[EXPIRES] = int(time.time()) + (ttl or self._default_ttl)
+            if self._expiry_heap is not None:
+                heapq.heappush(self._expiry_heap, (entry[EXPIRES], key))
+            self._dirty = True
+            self._maybe_flush()
+            return True
+    
+    def ttl(self, key: str) -> Optional[int]:
+        """Get the seconds left before key expires, or None if it is missing or expired"""
+        with self._lock:
+            if not self._enabled or key not in self.cache:
+                return None
+            remaining = self.cache[key][EXPIRES] - int(time.time())
+            return remaining if remaining > 0 else None
+    
+    def set(self, key: str, value: Any, ttl: int = None, validators: Optional[Dict[str, str]] = None):
+        """Set value in cache with TTL and optional HTTP validators"""
+        with self._lock:
+            if not self._enabled:
+                return
+            
+            ttl = ttl or self._default_ttl
+            now = int(time.time())
+            expires = now + ttl
+            self.cache[key] = [value, expires, now, validators] if validators else [value, expires, now]
+            if self._expiry_heap is not None:
+                heapq.heappush(self._expiry_heap, (expires, key))
+            self._dirty = True
+            
+            # Expired entries are otherwise only dropped when read, so sweep occasionally
+            if random.random() < self.CLEANUP_PROBABILITY:
+                self._cleanup()
+            self._maybe_flush()
     
     def delete(self, key: str):
         """Delete key from cache"""
-        if key in self.cache:
-            del self.cache[key]
-            self.save_cache()
+        with self._lock:
+            if key in self.cache:
+                del self.cache[key]
+                self._dirty = True
+                self._maybe_flush()
+    
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with prefix and return how many were removed"""
+        with self._lock:
+            keys = [key for key in self.cache if key.startswith(prefix)]
+            for key in keys:
+                del self.cache[key]
+            if keys:
+                self._dirty = True
+                self._maybe_flush()
+            return len(keys)
+    
+    def update_prefix(self, prefix: str, func: Callable[[Any], Any]) -> int:
+        """Replace the value of every live key starting with prefix by func(value), keeping its expiry"""
+        with self._lock:
+            current_time = int(time.time())
+            updated = 0
+            for key, entry in self.cache.items():
+                if key.startswith(prefix) and current_time < entry[EXPIRES]:
+                    entry[VALUE] = func(entry[VALUE])
+                    updated += 1
+            if updated:
+                self._dirty = True
+                self._maybe_flush()
+            return updated
     
     def clear(self):
         """Clear all cache"""
-        self.cache.clear()
-        self.save_cache()
-    
-    def _cleanup(self):
-        """Remove expired cache entries"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if current_time >= entry.get('expires', 0)
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        if expired_keys:
-            self.save_cache()
+        with self._lock:
+            self.cache.clear()
+            self._expiry_heap = []
+            self._dirty = True
+            # Clearing is an explicit user action, so persist it right away
+            self._maybe_flush(force=True)
+    
+    def _cleanup(self) -> int:
+        """Remove expired cache entries and return how many were removed"""
+        with self._lock:
+            current_time = int(time.time())
+            before = len(self.cache)
+            
+            if self._expiry_heap is None:
+                # First sweep since loading: drop expired entries and index the rest in one pass
+                self.cache = {
+                    key: entry for key, entry in self.cache.items()
+                    if current_time < entry[EXPIRES]
+                }
+                self._expiry_heap = [(entry[EXPIRES], key) for key, entry in self.cache.items()]
+                heapq.heapify(self._expiry_heap)
+            else:
+                heap = self._expiry_heap
+                while heap and heap[0][0] <= current_time:
+                    expires, key = heapq.heappop(heap)
+                    entry = self.cache.get(key)
+                    if entry is not None and entry[EXPIRES] <= current_time:
+                        del self.cache[key]
+            
+            removed = before - len(self.cache)
+            if removed:
+                self._dirty = True
+            return removed
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        current_time = time.time()
-        active_entries = sum(
-            1 for entry in self.cache.values()
-            if current_time < entry.get('expires', 0)
-        )
-        
-        return {
-            'total_entries': len(self.cache),
-            'active_entries': active_entries,
-            'expired_entries': len(self.cache) - active_entries,
-            'cache_size_mb': self.cache_file.stat().st_size / (1024 * 1024) if self.cache_file.exists() else 0
-        }
+        with self._lock:
+            total_entries = len(self.cache)
+            expired_entries = self._cleanup()
+            
+            # The size is tracked on every flush; only stat the file if nothing was written yet
+            if self._last_written_bytes is None:
+                self._last_written_bytes = self.cache_file.stat().st_size if self.cache_file.exists() else 0
+            
+            return {
+                'total_entries': total_entries,
+                'active_entries': total_entries - expired_entries,
+                'expired_entries': expired_entries,
+                'cache_size_mb': self._last_written_bytes / (1024 * 1024)
+            }
 
 
 # Global cache instance
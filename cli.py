@@ -5,12 +5,13 @@ Quick operations without the full interactive console
 """
 
 import click
+import random
+import secrets
+import string
 import sys
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
 
 from mailtm_client import MailTMClient
 from config import config
@@ -20,13 +21,19 @@ from exceptions import *
 console = Console()
 
 
+@lru_cache(maxsize=1)
+def _get_client() -> MailTMClient:
+    """Return the process-wide client, creating it on first use"""
+    return MailTMClient()
+
+
 @click.group()
 @click.version_option(version="2.0.0", prog_name="pryvon-temp-mail")
 @click.option('--debug', is_flag=True, help='Enable debug logging')
 def cli(debug):
     """Pryvon Temp Mail Command Line Interface"""
     if debug:
-        config.set('log_level', 'DEBUG')
+        config.set('log_level', 'DEBUG', persist=False)
         console.print("[yellow]Debug mode enabled[/yellow]")
 
 
@@ -38,7 +45,7 @@ def cli(debug):
 def create(username, domain, password, auto_login):
     """Create a new temporary email account"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         # Get available domains if not specified
         if not domain:
@@ -56,16 +63,12 @@ def create(username, domain, password, auto_login):
         
         # Generate username if not specified
         if not username:
-            import random
-            import string
             username = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
             console.print(f"[yellow]Generated username: {username}[/yellow]")
         
         # Generate password if not specified
         if not password:
-            import random
-            import string
-            password = ''.join(random.choices(string.ascii_lowercase + string.digits, k=12)
+            password = secrets.token_urlsafe(9)  # 12 characters
             console.print(f"[yellow]Generated password: {password}[/yellow]")
         
         full_address = f"{username}@{domain}"
@@ -93,7 +96,7 @@ def create(username, domain, password, auto_login):
 def login(address, password):
     """Login to an existing account"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         with console.status("Logging in..."):
             account, token = client.login(address, password)
@@ -114,8 +117,12 @@ def login(address, password):
 @click.option('--unread-only', is_flag=True, help='Show only unread messages')
 def list(limit, unread_only):
     """List messages in the current account"""
+    from rich.table import Table
+    from rich.text import Text
+    from rich import box
+    
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[red]Please login first using: pryvon-temp-mail login <address>[/red]")
@@ -145,14 +152,11 @@ def list(limit, unread_only):
         
         for message in messages:
             status = "📧" if not message.seen else "👁️"
-            date = message.created_at[:10]
-            size_kb = f"{message.size / 1024:.1f}KB" if message.size > 1024 else f"{message.size}B"
-            
             table.add_row(
-                message.from_address,
-                message.subject or "(No Subject)",
-                date,
-                size_kb,
+                Text(message.from_address),
+                Text(message.subject or "(No Subject)"),
+                message.date_short,
+                message.size_human,
                 status
             )
         
@@ -168,8 +172,11 @@ def list(limit, unread_only):
 @click.argument('message_id')
 def view(message_id):
     """View a specific message by ID"""
+    from rich.panel import Panel
+    from rich.text import Text
+    
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[red]Please login first using: pryvon-temp-mail login <address>[/red]")
@@ -180,10 +187,12 @@ def view(message_id):
         
         # Display message details
         console.print(Panel(
-            f"[bold]From:[/bold] {message_data.get('from', {}).get('address', 'Unknown')}\n"
-            f"[bold]Subject:[/bold] {message_data.get('subject', '(No Subject)')}\n"
-            f"[bold]Date:[/bold] {message_data.get('createdAt', 'Unknown')}\n"
-            f"[bold]Size:[/bold] {message_data.get('size', 0):,} bytes",
+            Text.assemble(
+                ("From:", "bold"), f" {message_data.get('from', {}).get('address', 'Unknown')}\n",
+                ("Subject:", "bold"), f" {message_data.get('subject', '(No Subject)')}\n",
+                ("Date:", "bold"), f" {message_data.get('createdAt', 'Unknown')}\n",
+                ("Size:", "bold"), f" {message_data.get('size', 0):,} bytes"
+            ),
             title="Message Details",
             border_style="blue"
         ))
@@ -191,7 +200,7 @@ def view(message_id):
         # Display content
         if 'text' in message_data and message_data['text']:
             console.print(Panel(
-                message_data['text'],
+                Text(message_data['text']),
                 title="Message Content",
                 border_style="green"
             ))
@@ -208,7 +217,7 @@ def view(message_id):
 def mark_read(message_id):
     """Mark a message as read"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[red]Please login first using: pryvon-temp-mail login <address>[/red]")
@@ -229,7 +238,7 @@ def mark_read(message_id):
 def delete(message_id):
     """Delete a message"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[red]Please login first using: pryvon-temp-mail login <address>[/red]")
@@ -246,17 +255,18 @@ def delete(message_id):
 
 
 @cli.command()
-def refresh():
+@click.option('--pages', default=1, help='Number of mailbox pages to fetch')
+def refresh(pages):
     """Refresh mailbox for new messages"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[red]Please login first using: pryvon-temp-mail login <address>[/red]")
             return
         
         with console.status("Refreshing mailbox..."):
-            messages = client.refresh_mailbox()
+            messages = client.refresh_mailbox(pages=pages)
         
         console.print(f"[green]✓[/green] Mailbox refreshed!")
         console.print(f"Total messages: [bold]{len(messages)}[/bold]")
@@ -273,8 +283,11 @@ def refresh():
 @cli.command()
 def stats():
     """Show account and cache statistics"""
+    from rich.panel import Panel
+    from rich.columns import Columns
+    
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[red]Please login first using: pryvon-temp-mail login <address>[/red]")
@@ -303,7 +316,6 @@ def stats():
             border_style="green"
         )
         
-        from rich.columns import Columns
         console.print(Columns([account_panel, cache_panel]))
         
     except Exception as e:
@@ -315,7 +327,7 @@ def stats():
 def logout():
     """Logout from current account"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         if not client.is_logged_in():
             console.print("[yellow]Not logged in[/yellow]")
@@ -332,8 +344,11 @@ def logout():
 @cli.command()
 def domains():
     """List available domains"""
+    from rich.table import Table
+    from rich import box
+    
     try:
-        client = MailTMClient()
+        client = _get_client()
         
         with console.status("Fetching domains..."):
             domains = client.get_domains()
@@ -366,7 +381,7 @@ def domains():
 def clear_cache():
     """Clear all cached data"""
     try:
-        client = MailTMClient()
+        client = _get_client()
         client.clear_cache()
         console.print("[green]✓[/green] Cache cleared")
         
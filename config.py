@@ -4,9 +4,15 @@ Configuration management for Mail.tm Console Client
 
 import os
 import json
+import atexit
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Callable, Iterable, List, Tuple
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
 
 
 @dataclass
@@ -16,11 +22,15 @@ class AppConfig:
     api_base_url: str = "https://api.mail.tm"
     api_timeout: int = 30
     max_retries: int = 3
+    prefetch_count: int = 5  # message bodies fetched ahead after listing the mailbox
     
     # UI Configuration
     refresh_interval: int = 30  # seconds
     max_messages_display: int = 100
+    max_message_bytes: int = 5_000_000  # larger message bodies are refused instead of buffered
     auto_refresh: bool = True
+    push_updates: bool = True  # subscribe to Mercure new-mail events instead of polling
+    mercure_url: str = "https://mercure.mail.tm/.well-known/mercure"
     
     # Security Configuration
     save_credentials: bool = False
@@ -43,45 +53,102 @@ class ConfigManager:
     def __init__(self, config_file: str = "~/.pryvon/config.json"):
         self.config_file = Path(config_file).expanduser()
         self.config = AppConfig()
+        # Live view of the config attributes; lookups skip getattr's fallback machinery
+        self._values: Dict[str, Any] = vars(self.config)
+        self._listeners: List[Callable[[str, Any], None]] = []
+        # Values saved to disk for keys that were overridden with persist=False
+        self._persisted_values: Dict[str, Any] = {}
+        self._dirty = False
+        # Bumped on every change; invalidates cached snapshots
+        self._version = 0
+        self._snapshots: Dict[Tuple[str, ...], Tuple[int, Dict[str, Any]]] = {}
         self.load_config()
+        
+        # Persist pending changes on interpreter shutdown
+        atexit.register(self.flush)
     
     def load_config(self):
         """Load configuration from file"""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    config_data = json.load(f)
-                    for key, value in config_data.items():
-                        if hasattr(self.config, key):
-                            setattr(self.config, key, value)
+                if orjson is not None:
+                    config_data = orjson.loads(self.config_file.read_bytes())
+                else:
+                    with open(self.config_file, 'r') as f:
+                        config_data = json.load(f)
+                for key, value in config_data.items():
+                    if hasattr(self.config, key):
+                        setattr(self.config, key, value)
         except Exception as e:
             print(f"Warning: Could not load config file: {e}")
     
     def save_config(self):
         """Save current configuration to file"""
+        data = {**self._values, **self._persisted_values} if self._persisted_values else self._values
         try:
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(asdict(self.config), f, indent=2)
+            if orjson is not None:
+                self.config_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                self.config_file.write_text(json.dumps(data, indent=2))
+            self._dirty = False
         except Exception as e:
             print(f"Warning: Could not save config file: {e}")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
-        return getattr(self.config, key, default)
+        return self._values.get(key, default)
+    
+    def snapshot(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several configuration values at once, cached until the next change"""
+        keys = tuple(keys)
+        cached = self._snapshots.get(keys)
+        if cached is None or cached[0] != self._version:
+            values = self._values
+            cached = (self._version, {key: values.get(key) for key in keys})
+            self._snapshots[keys] = cached
+        return cached[1]
+    
+    def flush(self):
+        """Save the configuration if it has unsaved changes"""
+        if self._dirty:
+            self.save_config()
     
-    def set(self, key: str, value: Any):
-        """Set configuration value"""
+    def set(self, key: str, value: Any, persist: bool = True):
+        """Set configuration value (saved on flush() or at exit unless persist=False)"""
         if hasattr(self.config, key):
+            if persist:
+                self._persisted_values.pop(key, None)
+                self._dirty = True
+            elif key not in self._persisted_values:
+                self._persisted_values[key] = self._values[key]
             setattr(self.config, key, value)
-            self.save_config()
+            self._notify(key, value)
     
     def update(self, **kwargs):
         """Update multiple configuration values"""
+        changed = {}
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+                self._persisted_values.pop(key, None)
+                changed[key] = value
         self.save_config()
+        for key, value in changed.items():
+            self._notify(key, value)
+    
+    def register_listener(self, listener: Callable[[str, Any], None]):
+        """Register a callback invoked with (key, value) whenever a value changes"""
+        self._listeners.append(listener)
+    
+    def _notify(self, key: str, value: Any):
+        """Invoke change listeners"""
+        self._version += 1
+        for listener in self._listeners:
+            try:
+                listener(key, value)
+            except Exception as e:
+                print(f"Warning: Config listener failed: {e}")
 
 
 # Global configuration instance
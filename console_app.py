@@ -5,28 +5,27 @@ A comprehensive console application for managing temporary email accounts
 """
 
 import os
+import re
+import atexit
 import sys
 import time
-import random
 import string
+import secrets
 import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
 from typing import List, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.text import Text
-from rich.align import Align
-from rich.layout import Layout
 from rich.live import Live
-from rich.spinner import Spinner
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import box
 from rich.console import Group
 from rich.columns import Columns
-from rich.status import Status
-from rich.syntax import Syntax
-from rich.traceback import install
 
 from mailtm_client import MailTMClient, MailAccount, MailMessage
 from config import config
@@ -34,14 +33,99 @@ from logger import logger
 from cache import cache
 from exceptions import *
 
-# Install rich traceback handler
-install(show_locals=False)
+# Install rich traceback handler unless disabled with RICH_TRACEBACK=0
+if os.environ.get('RICH_TRACEBACK', '1') != '0':
+    from rich.traceback import install
+    install(show_locals=False)
 
 console = Console()
 
+# Configuration keys shown on the settings screen
+_SETTINGS_KEYS = (
+    'cache_enabled', 'auto_refresh', 'refresh_interval', 'max_messages_display',
+    'api_timeout', 'log_level', 'max_retries'
+)
+
+# Usernames may contain letters, numbers, underscores and hyphens
+_USERNAME_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+# Maps every byte value onto the username alphabet so random bytes can be translated in one call
+_USERNAME_ALPHABET = (string.ascii_lowercase + string.digits).encode()
+_USERNAME_TABLE = bytes(_USERNAME_ALPHABET[b % len(_USERNAME_ALPHABET)] for b in range(256))
+
+
+class MenuAction(Enum):
+    """Main menu actions, valued by the app method that handles them"""
+    CHECK_MAILBOX = "check_mailbox"
+    REFRESH_MAILBOX = "refresh_mailbox"
+    VIEW_MESSAGE = "view_message"
+    MARK_MESSAGE_READ = "mark_message_read"
+    DELETE_MESSAGE = "delete_message"
+    ACCOUNT_STATS = "show_account_stats"
+    SETTINGS = "show_settings_menu"
+    DELETE_ACCOUNT = "delete_account"
+    LOGOUT = "logout"
+    CREATE_ACCOUNT = "create_account"
+    LOGIN = "login_account"
+    EXIT = "exit"
+
+
+# Main menu entries as (action, label, description)
+_LOGGED_IN_OPTIONS = (
+    (MenuAction.CHECK_MAILBOX, "📧 Check Mailbox", "Check for new emails"),
+    (MenuAction.REFRESH_MAILBOX, "🔄 Refresh Mailbox", "Refresh mailbox for latest messages"),
+    (MenuAction.VIEW_MESSAGE, "📝 View Message", "View full message content"),
+    (MenuAction.MARK_MESSAGE_READ, "👁️  Mark Message as Read", "Mark a message as read"),
+    (MenuAction.DELETE_MESSAGE, "🗑️  Delete Message", "Delete a message"),
+    (MenuAction.ACCOUNT_STATS, "📊 Account Statistics", "View account statistics and cache info"),
+    (MenuAction.SETTINGS, "⚙️  Settings", "Configure application settings"),
+    (MenuAction.DELETE_ACCOUNT, "❌ Delete Account", "Delete current account"),
+    (MenuAction.LOGOUT, "🚪 Logout", "Logout from current account"),
+    (MenuAction.EXIT, "❌ Exit", "Exit the application"),
+)
+
+_LOGGED_OUT_OPTIONS = (
+    (MenuAction.CREATE_ACCOUNT, "➕ Create New Account", "Create a new temporary email account"),
+    (MenuAction.LOGIN, "🔑 Login to Account", "Login to existing account"),
+    (MenuAction.SETTINGS, "⚙️  Settings", "Configure application settings"),
+    (MenuAction.EXIT, "❌ Exit", "Exit the application"),
+)
+
+# Prompt choices for each menu, derived from the option tables
+_LOGGED_IN_CHOICES = tuple(str(i) for i in range(1, len(_LOGGED_IN_OPTIONS) + 1))
+_LOGGED_OUT_CHOICES = tuple(str(i) for i in range(1, len(_LOGGED_OUT_OPTIONS) + 1))
+_SETTINGS_CHOICES = ("1", "2", "3", "4", "5", "6")
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
 def clear_screen():
-    """Clear the console screen"""
-    os.system('clear' if os.name == 'posix' else 'cls')
+    """Clear the console screen with an ANSI escape instead of spawning a clear/cls process"""
+    console.clear()
+
+
+@contextmanager
+def quick_status(message: str, min_duration: float = 0.15, spinner: str = "dots"):
+    """Show a status spinner only if the wrapped block takes longer than min_duration"""
+    status = console.status(message, spinner=spinner)
+    lock = threading.Lock()
+    state = {'done': False, 'started': False}
+    
+    def start():
+        with lock:
+            if not state['done']:
+                status.start()
+                state['started'] = True
+    
+    timer = threading.Timer(min_duration, start)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield status
+    finally:
+        timer.cancel()
+        with lock:
+            state['done'] = True
+            if state['started']:
+                status.stop()
 
 
 class PryvonTempMailApp:
@@ -50,9 +134,47 @@ class PryvonTempMailApp:
     def __init__(self):
         self.client = MailTMClient()
         self.running = True
+        self._closed = False
         self.auto_refresh_task = None
-        self.setup_signal_handlers()
+        self._stop_refresh = threading.Event()
+        # Auto-refresh results are coalesced into one redraw per 50 ms window
+        self._render_lock = threading.Lock()
+        self._render_dirty = False
+        self._flush_scheduled = False
+        self._new_message_ids = set()
+        self._mail_notice = ""
+        # Live mailbox view that auto-refresh updates in place while it is open
+        self._mailbox_live: Optional[Live] = None
+        # Set by screens that already waited for Enter, so run() skips its continue prompt
+        self._skip_continue_prompt = False
+        # Runs network calls that can overlap with user input
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pryvon")
+        
+        # Memoized renderables as {name: (signature, renderable)}; config-driven
+        # entries use _config_version as their signature
+        self._render_cache = {}
+        self._config_version = 0
+        config.register_listener(self._on_config_change)
         
+        # Last fetched message list, reused by the message screens for up to refresh_interval
+        self._messages_cache: Optional[List[MailMessage]] = None
+        self._messages_fetched_at = 0.0
+        self._unread_ids = set()
+        
+        self._actions = {
+            action: getattr(self, action.value) for action in MenuAction if action is not MenuAction.EXIT
+        }
+        self.setup_signal_handlers()
+        atexit.register(self.cleanup)
+    
+    def __enter__(self):
+        """Use the app as a context manager that cleans up on exit"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release resources when leaving the context"""
+        self.cleanup()
+    
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -66,19 +188,151 @@ class PryvonTempMailApp:
     
     def cleanup(self):
         """Cleanup resources before exit"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_auto_refresh()
+        
         try:
             if self.client.is_logged_in():
                 self.client.logout()
+            self.client.close()
+            self._pool.shutdown(wait=False)
             logger.info("Application shutdown complete")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
     
+    def _on_config_change(self, key, value):
+        """Invalidate renderables that display configuration values"""
+        self._config_version += 1
+    
+    def _memoized(self, name, signature, build):
+        """Return the cached renderable for name, rebuilding it when the signature changes"""
+        cached = self._render_cache.get(name)
+        if cached is None or cached[0] != signature:
+            cached = (signature, build())
+            self._render_cache[name] = cached
+        return cached[1]
+    
+    def _get_messages_cached(self) -> List[MailMessage]:
+        """Get the message list, reusing the last fetch while it is fresh"""
+        max_age = config.get('refresh_interval', 30)
+        if self._messages_cache is None or time.monotonic() - self._messages_fetched_at >= max_age:
+            self._store_messages(self.client.get_messages())
+        return self._messages_cache
+    
+    def _store_messages(self, messages: List[MailMessage]):
+        """Remember a freshly fetched message list"""
+        self._messages_cache = messages
+        self._messages_fetched_at = time.monotonic()
+        self._unread_ids = {m.id for m in messages if not m.seen}
+        
+        # Warm the message cache so opening one of the newest messages needs no round-trip
+        prefetch_count = config.get('prefetch_count', 5)
+        if prefetch_count and config.get('cache_enabled', True) and messages:
+            self._pool.submit(self.client.prefetch_messages, [m.id for m in messages[:prefetch_count]])
+    
+    def _mark_seen_locally(self, message: MailMessage):
+        """Reflect a message marked as read in the local message list"""
+        message.seen = True
+        self._unread_ids.discard(message.id)
+    
+    def _remove_locally(self, message: MailMessage):
+        """Reflect a deleted message in the local message list"""
+        if self._messages_cache is not None and message in self._messages_cache:
+            self._messages_cache.remove(message)
+        self._unread_ids.discard(message.id)
+    
+    def _invalidate_messages(self):
+        """Drop the local message list after the mailbox changed"""
+        self._messages_cache = None
+        self._unread_ids = set()
+    
+    def _start_auto_refresh(self):
+        """Start polling the mailbox in the background"""
+        # Push events only pay off in a long-running session, so one-shot CLI logins never subscribe
+        self.client.start_push_subscription()
+        self._stop_refresh.set()
+        self._stop_refresh = threading.Event()
+        self.auto_refresh_task = threading.Thread(
+            target=self._auto_refresh_loop, args=(self._stop_refresh,),
+            name="pryvon-auto-refresh", daemon=True
+        )
+        self.auto_refresh_task.start()
+    
+    def _stop_auto_refresh(self):
+        """Stop the background mailbox poller"""
+        self._stop_refresh.set()
+        self.client.mailbox_changed.set()  # wake the poller so it sees the stop
+        self._new_message_ids = set()
+        self._mail_notice = ""
+    
+    def _auto_refresh_loop(self, stop: threading.Event):
+        """Refresh the mailbox on push events, polling every refresh_interval seconds without push"""
+        changed = self.client.mailbox_changed
+        while not stop.is_set():
+            pushed = changed.wait(max(config.get('refresh_interval', 30), 1))
+            if stop.is_set():
+                break
+            changed.clear()
+            if not pushed and self.client.push_active():
+                continue
+            if not config.get('auto_refresh', True) or not self.client.is_logged_in():
+                continue
+            try:
+                messages = self.client.refresh_mailbox()
+            except Exception as e:
+                logger.debug(f"Auto-refresh failed: {e}")
+                continue
+            
+            if self._messages_cache is not None:
+                known_ids = {m.id for m in self._messages_cache}
+                self._new_message_ids.update(m.id for m in messages if m.id not in known_ids)
+            self._store_messages(messages)
+            self._mark_dirty()
+    
+    def _mark_dirty(self):
+        """Schedule a single redraw for all updates arriving within the next 50 ms"""
+        with self._render_lock:
+            self._render_dirty = True
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        timer = threading.Timer(0.05, self._flush)
+        timer.daemon = True
+        timer.start()
+    
+    def _flush(self):
+        """Apply the latest mailbox snapshot to the screen state"""
+        with self._render_lock:
+            self._flush_scheduled = False
+            if not self._render_dirty:
+                return
+            self._render_dirty = False
+        
+        live = self._mailbox_live
+        if live is not None:
+            self._clear_mail_notice()
+            live.update(self._build_live_mailbox(self._messages_cache or []))
+            return
+        
+        count = len(self._new_message_ids)
+        self._mail_notice = f"📬 {count} new message(s)" if count else ""
+    
+    def _clear_mail_notice(self):
+        """Forget new-mail notifications once the user has seen the mailbox"""
+        self._new_message_ids = set()
+        self._mail_notice = ""
+    
     def generate_random_string(self, length: int = 8) -> str:
         """Generate a random string for usernames"""
-        return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+        return os.urandom(length).translate(_USERNAME_TABLE).decode()
     
     def show_welcome(self):
         """Display enhanced welcome screen"""
+        from rich.align import Align
+        
         clear_screen()
         welcome_text = Text("Pryvon Temp Mail", style="bold blue")
         subtitle = Text("Professional Temporary Email Management Tool", style="italic")
@@ -96,86 +350,67 @@ class PryvonTempMailApp:
     
     def show_config_status(self):
         """Display configuration status"""
+        console.print(self._memoized("config_status", self._config_version, self._build_config_status))
+    
+    def _build_config_status(self):
+        """Build the configuration status columns"""
+        snap = config.snapshot(('cache_enabled', 'auto_refresh', 'log_level', 'api_timeout'))
         config_items = [
-            f"Cache: {'✓' if config.get('cache_enabled') else '✗'}",
-            f"Auto-refresh: {'✓' if config.get('auto_refresh') else '✗'}",
-            f"Log Level: {config.get('log_level', 'INFO')}",
-            f"API Timeout: {config.get('api_timeout', 30)}s"
+            f"Cache: {'✓' if snap['cache_enabled'] else '✗'}",
+            f"Auto-refresh: {'✓' if snap['auto_refresh'] else '✗'}",
+            f"Log Level: {snap['log_level'] or 'INFO'}",
+            f"API Timeout: {snap['api_timeout'] or 30}s"
         ]
         
-        console.print(Columns(config_items, equal=True, expand=True))
+        return Columns(config_items, equal=True, expand=True)
     
     def show_main_menu(self):
         """Display enhanced main menu"""
         clear_screen()
-        if self.client.is_logged_in():
+        logged_in = self.client.is_logged_in()
+        renderables = []
+        
+        if logged_in:
             account = self.client.current_account
             stats = self.client.get_account_stats()
-            
-            # Account status panel
-            status_panel = Panel(
-                f"[bold]{account.address}[/bold]\n"
-                f"Quota: {stats['quota_used']:,}/{stats['quota_total']:,} bytes "
-                f"({stats['quota_percentage']}%)\n"
-                f"Created: {stats['created_at'][:10]} | "
-                f"Requests: {stats['request_count']}",
-                title="Account Status",
-                border_style="green"
-            )
-            console.print(status_panel)
-            
-            options = [
-                "📧 Check Mailbox",
-                "🔄 Refresh Mailbox", 
-                "📝 View Message",
-                "👁️  Mark Message as Read",
-                "🗑️  Delete Message",
-                "📊 Account Statistics",
-                "⚙️  Settings",
-                "❌ Delete Account",
-                "🚪 Logout",
-                "❌ Exit"
-            ]
-        else:
-            options = [
-                "➕ Create New Account",
-                "🔑 Login to Account",
-                "⚙️  Settings",
-                "❌ Exit"
-            ]
+            signature = (account.address, stats['quota_used'], stats['quota_total'],
+                         stats['created_at'], stats['request_count'], self._mail_notice)
+            notice = self._mail_notice
+            renderables.append(self._memoized(
+                "status_panel", signature, lambda: self._build_status_panel(account, stats, notice)
+            ))
         
+        renderables.append(self._memoized("main_menu", logged_in, lambda: self._build_menu_table(
+            _LOGGED_IN_OPTIONS if logged_in else _LOGGED_OUT_OPTIONS
+        )))
+        
+        # Render the whole screen in a single print
+        renderables.append("")
+        console.print(Group(*renderables))
+    
+    def _build_status_panel(self, account, stats, notice=""):
+        """Build the account status panel"""
+        content = (
+            f"[bold]{account.address}[/bold]\n"
+            f"Quota: {stats['quota_used']:,}/{stats['quota_total']:,} bytes "
+            f"({stats['quota_percentage']}%)\n"
+            f"Created: {stats['created_at'][:10]} | "
+            f"Requests: {stats['request_count']}"
+        )
+        if notice:
+            content += f"\n[yellow]{notice}[/yellow]"
+        return Panel(content, title="Account Status", border_style="green")
+    
+    def _build_menu_table(self, options):
+        """Build the main menu options table"""
         table = Table(title="Pryvon Temp Mail Client", box=box.ROUNDED, border_style="blue")
         table.add_column("Option", style="cyan", no_wrap=True)
         table.add_column("Description", style="white")
         
-        for i, option in enumerate(options, 1):
-            if "📧" in option:
-                table.add_row(str(i), "Check for new emails")
-            elif "🔄" in option:
-                table.add_row(str(i), "Refresh mailbox for latest messages")
-            elif "📝" in option:
-                table.add_row(str(i), "View full message content")
-            elif "👁️" in option:
-                table.add_row(str(i), "Mark a message as read")
-            elif "🗑️" in option:
-                table.add_row(str(i), "Delete a message")
-            elif "📊" in option:
-                table.add_row(str(i), "View account statistics and cache info")
-            elif "⚙️" in option:
-                table.add_row(str(i), "Configure application settings")
-            elif "❌" in option and "Account" in option:
-                table.add_row(str(i), "Delete current account")
-            elif "🚪" in option:
-                table.add_row(str(i), "Logout from current account")
-            elif "➕" in option:
-                table.add_row(str(i), "Create a new temporary email account")
-            elif "🔑" in option:
-                table.add_row(str(i), "Login to existing account")
-            elif "❌" in option and "Exit" in option:
-                table.add_row(str(i), "Exit the application")
-        
-        console.print(table)
-        console.print()
+        for i, (_action, _label, description) in enumerate(options, 1):
+            table.add_row(str(i), description)
+        
+        return table
     
     def show_settings_menu(self):
         """Display and manage application settings"""
@@ -184,36 +419,9 @@ class PryvonTempMailApp:
         console.print()
         
         while True:
-            settings_table = Table(title="Current Settings", box=box.ROUNDED)
-            settings_table.add_column("Setting", style="cyan")
-            settings_table.add_column("Value", style="white")
-            settings_table.add_column("Description", style="dim")
-            
-            settings = [
-                ("Cache Enabled", str(config.get('cache_enabled')), "Enable/disable caching"),
-                ("Auto Refresh", str(config.get('auto_refresh')), "Auto-refresh mailbox"),
-                ("Refresh Interval", f"{config.get('refresh_interval')}s", "Mailbox refresh interval"),
-                ("Max Messages", str(config.get('max_messages_display')), "Max messages to display"),
-                ("API Timeout", f"{config.get('api_timeout')}s", "API request timeout"),
-                ("Log Level", config.get('log_level'), "Logging verbosity"),
-                ("Max Retries", str(config.get('max_retries')), "API retry attempts")
-            ]
-            
-            for setting, value, description in settings:
-                settings_table.add_row(setting, value, description)
-            
-            console.print(settings_table)
-            console.print()
+            console.print(self._memoized("settings", self._config_version, self._build_settings_screen))
             
-            console.print("Options:")
-            console.print("1. Toggle cache")
-            console.print("2. Toggle auto-refresh")
-            console.print("3. Change refresh interval")
-            console.print("4. Change log level")
-            console.print("5. Clear cache")
-            console.print("6. Back to main menu")
-            
-            choice = Prompt.ask("Select option", choices=["1", "2", "3", "4", "5", "6"])
+            choice = Prompt.ask("Select option", choices=_SETTINGS_CHOICES)
             
             if choice == "1":
                 current = config.get('cache_enabled')
@@ -228,8 +436,7 @@ class PryvonTempMailApp:
                 config.set('refresh_interval', interval)
                 console.print(f"[green]Refresh interval set to {interval} seconds[/green]")
             elif choice == "4":
-                levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
-                level = Prompt.ask("Select log level", choices=levels, default=config.get('log_level'))
+                level = Prompt.ask("Select log level", choices=_LOG_LEVELS, default=config.get('log_level'))
                 config.set('log_level', level)
                 console.print(f"[green]Log level set to {level}[/green]")
             elif choice == "5":
@@ -237,10 +444,44 @@ class PryvonTempMailApp:
                     self.client.clear_cache()
                     console.print("[green]Cache cleared[/green]")
             elif choice == "6":
+                config.flush()
                 break
             
             console.print()
     
+    def _build_settings_screen(self):
+        """Build the settings table and option list"""
+        settings_table = Table(title="Current Settings", box=box.ROUNDED)
+        settings_table.add_column("Setting", style="cyan")
+        settings_table.add_column("Value", style="white")
+        settings_table.add_column("Description", style="dim")
+        
+        snap = config.snapshot(_SETTINGS_KEYS)
+        settings = [
+            ("Cache Enabled", str(snap['cache_enabled']), "Enable/disable caching"),
+            ("Auto Refresh", str(snap['auto_refresh']), "Auto-refresh mailbox"),
+            ("Refresh Interval", f"{snap['refresh_interval']}s", "Mailbox refresh interval"),
+            ("Max Messages", str(snap['max_messages_display']), "Max messages to display"),
+            ("API Timeout", f"{snap['api_timeout']}s", "API request timeout"),
+            ("Log Level", snap['log_level'], "Logging verbosity"),
+            ("Max Retries", str(snap['max_retries']), "API retry attempts")
+        ]
+        
+        for setting, value, description in settings:
+            settings_table.add_row(setting, value, description)
+        
+        return Group(
+            settings_table,
+            "",
+            "Options:",
+            "1. Toggle cache",
+            "2. Toggle auto-refresh",
+            "3. Change refresh interval",
+            "4. Change log level",
+            "5. Clear cache",
+            "6. Back to main menu"
+        )
+    
     def create_account(self):
         """Create a new mail.tm account with enhanced validation"""
         clear_screen()
@@ -249,8 +490,8 @@ class PryvonTempMailApp:
         
         try:
             # Get available domains
-            with console.status("[bold green]Fetching available domains...", spinner="dots"):
-                domains = self.client.get_domains()
+            with quick_status("[bold green]Fetching available domains..."):
+                domains = self.client.get_domains_cached()
             
             if not domains:
                 console.print("[red]No domains available[/red]")
@@ -278,7 +519,7 @@ class PryvonTempMailApp:
                 console.print(f"[yellow]Generated username: {username}[/yellow]")
             
             # Validate username
-            if not username.replace('_', '').replace('-', '').isalnum():
+            if not _USERNAME_RE.fullmatch(username):
                 console.print("[red]Username must contain only letters, numbers, underscores, and hyphens[/red]")
                 return
             
@@ -316,7 +557,7 @@ class PryvonTempMailApp:
             # Generate password
             password = Prompt.ask("Enter password (or press Enter for random)")
             if not password:
-                password = self.generate_random_string(12)
+                password = secrets.token_urlsafe(9)  # 12 characters
                 console.print(f"[yellow]Generated password: {password}[/yellow]")
             
             # Validate password
@@ -327,7 +568,7 @@ class PryvonTempMailApp:
             full_address = f"{username}@{domain}"
             
             if Confirm.ask(f"Create account: [bold]{full_address}[/bold]?"):
-                with console.status("[bold green]Creating account...", spinner="dots"):
+                with quick_status("[bold green]Creating account..."):
                     account = self.client.create_account(full_address, password)
                 
                 console.print(f"[green]✓[/green] Account created successfully!")
@@ -338,6 +579,8 @@ class PryvonTempMailApp:
                 
                 if Confirm.ask("Login to this account now?"):
                     self.client.login(full_address, password)
+                    self._invalidate_messages()
+                    self._start_auto_refresh()
                     console.print("[green]✓[/green] Logged in successfully!")
         
         except ValidationError as e:
@@ -358,8 +601,10 @@ class PryvonTempMailApp:
             address = Prompt.ask("Enter email address")
             password = Prompt.ask("Enter password", password=True)
             
-            with console.status("[bold green]Logging in...", spinner="dots"):
+            with quick_status("[bold green]Logging in..."):
                 account, token = self.client.login(address, password)
+            self._invalidate_messages()
+            self._start_auto_refresh()
             
             console.print(f"[green]✓[/green] Login successful!")
             console.print(f"Welcome back, [bold]{account.address}[/bold]")
@@ -383,54 +628,84 @@ class PryvonTempMailApp:
         
         clear_screen()
         try:
-            with console.status("[bold green]Fetching messages...", spinner="dots"):
-                messages = self.client.get_messages()
+            with quick_status("[bold green]Fetching messages..."):
+                messages = self._get_messages_cached()
+            self._clear_mail_notice()
+            
+            # The live view also opens on an empty mailbox, so new mail shows up as it arrives
+            if config.get('auto_refresh', True):
+                self._show_live_mailbox(messages)
+                return
             
             if not messages:
                 console.print("[yellow]No messages in mailbox[/yellow]")
                 return
             
             # Debug: Show message count
-            console.print(f"[dim]Debug: Retrieved {len(messages)} messages[/dim]")
+            renderables = [f"[dim]Debug: Retrieved {len(messages)} messages[/dim]"]
             if messages and len(messages) > 0:
-                console.print(f"[dim]First message structure: {messages[0]}[/dim]")
-            
-            # Display messages in a table
-            message_table = Table(title="Mailbox", box=box.ROUNDED)
-            message_table.add_column("From", style="cyan", no_wrap=True)
-            message_table.add_column("Subject", style="white")
-            message_table.add_column("Preview", style="dim")
-            message_table.add_column("Date", style="green")
-            message_table.add_column("Size", style="yellow")
-            message_table.add_column("Status", style="yellow")
-            
-            for message in messages:
-                status = "📧" if not message.seen else "👁️"
-                date = message.created_at[:10]  # Just the date part
-                preview = message.intro[:50] + "..." if len(message.intro) > 50 else message.intro
-                size_kb = f"{message.size / 1024:.1f}KB" if message.size > 1024 else f"{message.size}B"
-                
-                message_table.add_row(
-                    message.from_address,
-                    message.subject or "(No Subject)",
-                    preview,
-                    date,
-                    size_kb,
-                    status
-                )
-            
-            console.print(message_table)
-            console.print(f"[dim]Total messages: {len(messages)}[/dim]")
+                renderables.append(Text(f"First message structure: {messages[0]}", style="dim"))
+            renderables.append(self._build_mailbox(messages))
             
-            # Show unread count
-            unread = [m for m in messages if not m.seen]
-            if unread:
-                console.print(f"[yellow]⚠️  {len(unread)} unread message(s)[/yellow]")
+            console.print(Group(*renderables))
         
         except Exception as e:
             console.print(f"[red]Error fetching messages: {str(e)}[/red]")
             logger.error(f"Mailbox check error: {e}")
     
+    def _show_live_mailbox(self, messages: List[MailMessage]):
+        """Show the mailbox in place, letting auto-refresh update it until Enter is pressed"""
+        closed = threading.Event()
+        
+        def wait_for_enter():
+            sys.stdin.readline()
+            closed.set()
+        
+        with Live(self._build_live_mailbox(messages), console=console,
+                  refresh_per_second=8, screen=False) as live:
+            self._mailbox_live = live
+            try:
+                threading.Thread(target=wait_for_enter, name="pryvon-live-input", daemon=True).start()
+                closed.wait()
+            finally:
+                self._mailbox_live = None
+        self._skip_continue_prompt = True
+    
+    def _build_live_mailbox(self, messages: List[MailMessage]):
+        """Build the mailbox view shown while auto-refresh is running"""
+        return Group(
+            self._build_mailbox(messages) if messages else "[yellow]No messages yet[/yellow]",
+            f"[dim]Auto-refreshing every {config.get('refresh_interval', 30)}s - press Enter to return[/dim]"
+        )
+    
+    def _build_mailbox(self, messages: List[MailMessage]):
+        """Build the mailbox table with its totals"""
+        # Display messages in a table
+        message_table = Table(title="Mailbox", box=box.ROUNDED)
+        message_table.add_column("From", style="cyan", no_wrap=True)
+        message_table.add_column("Subject", style="white")
+        message_table.add_column("Preview", style="dim")
+        message_table.add_column("Date", style="green")
+        message_table.add_column("Size", style="yellow")
+        message_table.add_column("Status", style="yellow")
+        
+        rows = (
+            (Text(m.from_address), Text(m.subject or "(No Subject)"), Text(m.preview_50),
+             m.date_short, m.size_human, "📧" if not m.seen else "👁️")
+            for m in messages
+        )
+        add_row = message_table.add_row
+        for row in rows:
+            add_row(*row)
+        
+        renderables = [message_table, f"[dim]Total messages: {len(messages)}[/dim]"]
+        
+        # Show unread count
+        if self._unread_ids:
+            renderables.append(f"[yellow]⚠️  {len(self._unread_ids)} unread message(s)[/yellow]")
+        
+        return Group(*renderables)
+    
     def refresh_mailbox(self):
         """Refresh mailbox for new messages"""
         if not self.client.is_logged_in():
@@ -438,16 +713,17 @@ class PryvonTempMailApp:
             return
         
         try:
-            with console.status("[bold green]Refreshing mailbox...", spinner="dots"):
+            with quick_status("[bold green]Refreshing mailbox..."):
                 messages = self.client.refresh_mailbox()
+            self._store_messages(messages)
+            self._clear_mail_notice()
             
             console.print(f"[green]✓[/green] Mailbox refreshed!")
             console.print(f"Total messages: [bold]{len(messages)}[/bold]")
             
             # Check for new unread messages
-            unread = [m for m in messages if not m.seen]
-            if unread:
-                console.print(f"[yellow]⚠️  {len(unread)} unread message(s)[/yellow]")
+            if self._unread_ids:
+                console.print(f"[yellow]⚠️  {len(self._unread_ids)} unread message(s)[/yellow]")
         
         except Exception as e:
             console.print(f"[red]Error refreshing mailbox: {str(e)}[/red]")
@@ -462,7 +738,7 @@ class PryvonTempMailApp:
         clear_screen()
         try:
             # First show message list
-            messages = self.client.get_messages()
+            messages = self._get_messages_cached()
             if not messages:
                 console.print("[yellow]No messages to view[/yellow]")
                 return
@@ -475,64 +751,72 @@ class PryvonTempMailApp:
             msg_table.add_column("Date", style="dim")
             msg_table.add_column("Status", style="yellow")
             
-            for i, message in enumerate(messages, 1):
-                date = message.created_at[:10]
-                status = "📧" if not message.seen else "👁️"
-                msg_table.add_row(
-                    str(i),
-                    message.from_address,
-                    message.subject or "(No Subject)",
-                    date,
-                    status
-                )
+            rows = (
+                (str(i), Text(m.from_address), Text(m.subject or "(No Subject)"), m.date_short,
+                 "📧" if not m.seen else "👁️")
+                for i, m in enumerate(messages, 1)
+            )
+            add_row = msg_table.add_row
+            for row in rows:
+                add_row(*row)
             
             console.print(msg_table)
             
+            # Fetch the default selection in the background while the user chooses
+            prefetch = self._pool.submit(self.client.get_message, messages[0].id)
+            
             # Get user selection
             choice = IntPrompt.ask("Enter message number to view", default=1, show_default=True)
             if 1 <= choice <= len(messages):
                 message = messages[choice - 1]
                 
-                with console.status("[bold green]Fetching message...", spinner="dots"):
-                    full_message = self.client.get_message(message.id)
+                with quick_status("[bold green]Fetching message..."):
+                    if choice == 1:
+                        full_message = prefetch.result()
+                    else:
+                        full_message = self.client.get_message(message.id)
                 
                 # Display full message
-                console.print()
-                console.print(Panel(
-                    f"[bold]From:[/bold] {message.from_address}\n"
-                    f"[bold]To:[/bold] {message.to_address}\n"
-                    f"[bold]Subject:[/bold] {message.subject or '(No Subject)'}\n"
-                    f"[bold]Date:[/bold] {message.created_at}\n"
-                    f"[bold]Size:[/bold] {message.size:,} bytes\n"
-                    f"[bold]Attachments:[/bold] {'Yes' if message.has_attachments else 'No'}",
+                details_panel = Panel(
+                    Text.assemble(
+                        ("From:", "bold"), f" {message.from_address}\n",
+                        ("To:", "bold"), f" {message.to_address}\n",
+                        ("Subject:", "bold"), f" {message.subject or '(No Subject)'}\n",
+                        ("Date:", "bold"), f" {message.created_at}\n",
+                        ("Size:", "bold"), f" {message.size:,} bytes\n",
+                        ("Attachments:", "bold"), f" {'Yes' if message.has_attachments else 'No'}"
+                    ),
                     title="Message Details",
                     border_style="blue"
-                ))
+                )
                 
                 # Display message content
                 if 'text' in full_message and full_message['text']:
-                    console.print(Panel(
-                        full_message['text'],
+                    content_panel = Panel(
+                        Text(full_message['text']),
                         title="Message Content",
                         border_style="green"
-                    ))
+                    )
                 elif 'html' in full_message and full_message['html']:
-                    console.print(Panel(
+                    content_panel = Panel(
                         "[dim]HTML content available[/dim]",
                         title="Message Content (HTML)",
                         border_style="green"
-                    ))
+                    )
                 else:
-                    console.print(Panel(
+                    content_panel = Panel(
                         "[dim]No text content available[/dim]",
                         title="Message Content",
                         border_style="green"
-                    ))
+                    )
+                
+                console.print(Group("", details_panel, content_panel))
                 
                 # Mark as seen if not already
                 if not message.seen:
                     if Confirm.ask("Mark message as read?"):
                         self.client.mark_message_seen(message.id)
+                        self._mark_seen_locally(message)
                         console.print("[green]✓[/green] Message marked as read")
         
         except Exception as e:
@@ -546,8 +830,8 @@ class PryvonTempMailApp:
             return
         
         try:
-            messages = self.client.get_messages()
-            unread_messages = [m for m in messages if not m.seen]
+            messages = self._get_messages_cached()
+            unread_messages = [m for m in messages if m.id in self._unread_ids]
             
             if not unread_messages:
                 console.print("[yellow]No unread messages[/yellow]")
@@ -560,14 +844,13 @@ class PryvonTempMailApp:
             unread_table.add_column("Subject", style="green")
             unread_table.add_column("Date", style="dim")
             
-            for i, message in enumerate(unread_messages, 1):
-                date = message.created_at[:10]
-                unread_table.add_row(
-                    str(i),
-                    message.from_address,
-                    message.subject or "(No Subject)",
-                    date
-                )
+            rows = (
+                (str(i), Text(m.from_address), Text(m.subject or "(No Subject)"), m.date_short)
+                for i, m in enumerate(unread_messages, 1)
+            )
+            add_row = unread_table.add_row
+            for row in rows:
+                add_row(*row)
             
             console.print(unread_table)
             
@@ -575,8 +858,9 @@ class PryvonTempMailApp:
             if 1 <= choice <= len(unread_messages):
                 message = unread_messages[choice - 1]
                 
-                with console.status("[bold green]Marking as read...", spinner="dots"):
+                with quick_status("[bold green]Marking as read..."):
                     self.client.mark_message_seen(message.id)
+                self._mark_seen_locally(message)
                 
                 console.print(f"[green]✓[/green] Message marked as read")
         
@@ -591,7 +875,7 @@ class PryvonTempMailApp:
             return
         
         try:
-            messages = self.client.get_messages()
+            messages = self._get_messages_cached()
             if not messages:
                 console.print("[yellow]No messages to delete[/yellow]")
                 return
@@ -603,14 +887,13 @@ class PryvonTempMailApp:
             msg_table.add_column("Subject", style="green")
             msg_table.add_column("Date", style="dim")
             
-            for i, message in enumerate(messages, 1):
-                date = message.created_at[:10]
-                msg_table.add_row(
-                    str(i),
-                    message.from_address,
-                    message.subject or "(No Subject)",
-                    date
-                )
+            rows = (
+                (str(i), Text(m.from_address), Text(m.subject or "(No Subject)"), m.date_short)
+                for i, m in enumerate(messages, 1)
+            )
+            add_row = msg_table.add_row
+            for row in rows:
+                add_row(*row)
             
             console.print(msg_table)
             
@@ -618,9 +901,10 @@ class PryvonTempMailApp:
             if 1 <= choice <= len(messages):
                 message = messages[choice - 1]
                 
-                if Confirm.ask(f"Delete message from {message.from_address}?"):
-                    with console.status("[bold green]Deleting message...", spinner="dots"):
+                if Confirm.ask(Text.assemble("Delete message from ", message.from_address, "?")):
+                    with quick_status("[bold green]Deleting message..."):
                         self.client.delete_message(message.id)
+                    self._remove_locally(message)
                     
                     console.print(f"[green]✓[/green] Message deleted")
         
@@ -683,11 +967,13 @@ class PryvonTempMailApp:
         if Confirm.ask("[red]Are you absolutely sure?[/red]"):
             if Confirm.ask("Final confirmation - delete account?"):
                 try:
-                    with console.status("[bold red]Deleting account...", spinner="dots"):
+                    with quick_status("[bold red]Deleting account..."):
                         self.client.delete_account()
                     
                     console.print(f"[green]✓[/green] Account {account.address} deleted")
+                    self._stop_auto_refresh()
                     self.client.logout()
+                    self._invalidate_messages()
                 
                 except Exception as e:
                     console.print(f"[red]Error deleting account: {str(e)}[/red]")
@@ -700,7 +986,9 @@ class PryvonTempMailApp:
             return
         
         account = self.client.current_account.address
+        self._stop_auto_refresh()
         self.client.logout()
+        self._invalidate_messages()
         console.print(f"[green]✓[/green] Logged out from {account}")
     
     def run(self):
@@ -712,44 +1000,22 @@ class PryvonTempMailApp:
                 self.show_main_menu()
                 
                 if self.client.is_logged_in():
-                    choice = Prompt.ask("Select option", choices=[str(i) for i in range(1, 11)])
-                    
-                    if choice == "1":
-                        self.check_mailbox()
-                    elif choice == "2":
-                        self.refresh_mailbox()
-                    elif choice == "3":
-                        self.view_message()
-                    elif choice == "4":
-                        self.mark_message_read()
-                    elif choice == "5":
-                        self.delete_message()
-                    elif choice == "6":
-                        self.show_account_stats()
-                    elif choice == "7":
-                        self.show_settings_menu()
-                    elif choice == "8":
-                        self.delete_account()
-                    elif choice == "9":
-                        self.logout()
-                    elif choice == "10":
-                        self.running = False
+                    options, choices = _LOGGED_IN_OPTIONS, _LOGGED_IN_CHOICES
                 else:
-                    choice = Prompt.ask("Select option", choices=[str(i) for i in range(1, 5)])
-                    
-                    if choice == "1":
-                        self.create_account()
-                    elif choice == "2":
-                        self.login_account()
-                    elif choice == "3":
-                        self.show_settings_menu()
-                    elif choice == "4":
-                        self.running = False
+                    options, choices = _LOGGED_OUT_OPTIONS, _LOGGED_OUT_CHOICES
+                choice = Prompt.ask("Select option", choices=choices)
+                
+                action = options[int(choice) - 1][0]
+                self._skip_continue_prompt = False
+                if action is MenuAction.EXIT:
+                    self.running = False
+                else:
+                    self._actions[action]()
                 
-                if self.running:
+                # show_main_menu clears the screen on the next pass
+                if self.running and not self._skip_continue_prompt:
                     console.print()
                     Prompt.ask("Press Enter to continue...")
-                    clear_screen()
                 
             except KeyboardInterrupt:
                 console.print("\n[yellow]Interrupted by user[/yellow]")
@@ -758,7 +1024,6 @@ class PryvonTempMailApp:
                 console.print(f"[red]Unexpected error: {str(e)}[/red]")
                 logger.error(f"Unexpected error: {e}")
                 Prompt.ask("Press Enter to continue...")
-                clear_screen()
         
         # Cleanup
         self.cleanup()
@@ -769,8 +1034,8 @@ class PryvonTempMailApp:
 def main():
     """Main entry point with enhanced error handling"""
     try:
-        app = PryvonTempMailApp()
-        app.run()
+        with PryvonTempMailApp() as app:
+            app.run()
     except KeyboardInterrupt:
         console.print("\n[yellow]Goodbye![/yellow]")
     except Exception as e:
@@ -36,6 +36,11 @@ class APIError(MailTMError):
         self.response_data = response_data
 
 
+class MessageTooLargeError(MailTMError):
+    """Message body exceeds the configured size limit"""
+    pass
+
+
 class NetworkError(MailTMError):
     """Network/connection error"""
     pass
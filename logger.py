@@ -2,13 +2,20 @@
 Logging configuration for Mail.tm Console Client
 """
 
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from config import config
 
 
+def _file_level(log_level: str) -> int:
+    """Level for the log file: everything when debugging, otherwise warnings and above"""
+    return logging.DEBUG if log_level == 'DEBUG' else logging.WARNING
+
+
 def setup_logger(name: str = "pryvon_temp_mail") -> logging.Logger:
     """Setup and configure logger"""
     logger = logging.getLogger(name)
@@ -44,12 +51,25 @@ def setup_logger(name: str = "pryvon_temp_mail") -> logging.Logger:
             maxBytes=1024 * 1024,  # 1MB
             backupCount=5
         )
-        file_handler.setLevel(logging.DEBUG)
+        file_handler.setLevel(_file_level(config.get('log_level', 'INFO')))
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        
+        # Write the file from a background thread so logging calls never wait on disk I/O
+        listener = QueueListener(queue.SimpleQueue(), file_handler, respect_handler_level=True)
+        logger.addHandler(QueueHandler(listener.queue))
+        listener.start()
+        atexit.register(listener.stop)
     except Exception as e:
+        file_handler = None
         logger.warning(f"Could not setup file logging: {e}")
     
+    def on_config_change(key, value):
+        if key == 'log_level':
+            logger.setLevel(getattr(logging, value))
+            if file_handler is not None:
+                file_handler.setLevel(_file_level(value))
+    
+    config.register_listener(on_config_change)
     return logger
 
 
@@ -1,13 +1,24 @@
 import requests
+import itertools
 import json
+import logging
+import re
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import urllib3
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # Fall back to response.json()
+    orjson = None
+
 from config import config
 from logger import logger
 from cache import cache
@@ -17,6 +28,8 @@ from exceptions import *
 @dataclass
 class MailAccount:
     """Represents a mail.tm account"""
+    __slots__ = ('id', 'address', 'quota', 'used', 'is_disabled', 'is_deleted', 'created_at', 'updated_at')
+    
     id: str
     address: str
     quota: int
@@ -25,11 +38,30 @@ class MailAccount:
     is_deleted: bool
     created_at: str
     updated_at: str
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MailAccount':
+        """Build an account from an API account object"""
+        return cls(
+            id=data['id'],
+            address=data['address'],
+            quota=data['quota'],
+            used=data['used'],
+            is_disabled=data['isDisabled'],
+            is_deleted=data['isDeleted'],
+            created_at=data['createdAt'],
+            updated_at=data['updatedAt']
+        )
 
 
 @dataclass
 class MailMessage:
     """Represents an email message"""
+    # size_human, date_short and preview_50 are display values derived once at parse time
+    __slots__ = ('id', 'from_address', 'to_address', 'subject', 'intro', 'seen', 'is_deleted',
+                 'has_attachments', 'size', 'download_url', 'created_at', 'updated_at',
+                 'size_human', 'date_short', 'preview_50')
+    
     id: str
     from_address: str
     to_address: str
@@ -42,18 +74,165 @@ class MailMessage:
     download_url: str
     created_at: str
     updated_at: str
+    
+    def __post_init__(self):
+        self.size_human = f"{self.size / 1024:.1f}KB" if self.size > 1024 else f"{self.size}B"
+        self.date_short = self.created_at[:10]
+        self.preview_50 = self.intro[:50] + "..." if len(self.intro) > 50 else self.intro
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MailMessage':
+        """Build a message from an API message object, treating explicit nulls as missing"""
+        sender = data.get('from')
+        recipients = data.get('to')
+        return cls(
+            id=data.get('id') or '',
+            from_address=(sender.get('address') or '') if isinstance(sender, dict) else str(sender or ''),
+            to_address=(
+                (recipients[0].get('address') or '')
+                if recipients and isinstance(recipients, list) and isinstance(recipients[0], dict) else ''
+            ),
+            subject=data.get('subject') or '',
+            intro=data.get('intro') or '',
+            seen=bool(data.get('seen')),
+            is_deleted=bool(data.get('isDeleted')),
+            has_attachments=bool(data.get('hasAttachments')),
+            size=data.get('size') or 0,
+            download_url=data.get('downloadUrl') or '',
+            created_at=data.get('createdAt') or '',
+            updated_at=data.get('updatedAt') or ''
+        )
+
+
+# HTTP methods retried on connection errors and retryable status codes
+RETRY_METHODS = frozenset(["HEAD", "GET", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"])
+
+# Bounds for cache lifetimes taken from response headers, in seconds
+MIN_CACHE_TTL = 60
+MAX_CACHE_TTL = 604800
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+def _ttl_from_response(response: requests.Response, default: int) -> int:
+    """Cache lifetime from Cache-Control max-age or Expires, falling back to default"""
+    ttl = default
+    match = _MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+    if match:
+        ttl = int(match.group(1))
+    elif 'Expires' in response.headers:
+        try:
+            expires = parsedate_to_datetime(response.headers['Expires'])
+            ttl = int((expires - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return max(MIN_CACHE_TTL, min(ttl, MAX_CACHE_TTL))
+
+
+def _json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _read_capped(response: requests.Response, max_bytes: int):
+    """Read a streamed response body, refusing bodies larger than max_bytes"""
+    length = response.headers.get('Content-Length')
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        raise MessageTooLargeError(f"Message is {int(length):,} bytes, over the {max_bytes:,} byte limit")
+    
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=65536):
+        body += chunk
+        if len(body) > max_bytes:
+            response.close()
+            raise MessageTooLargeError(f"Message is over the {max_bytes:,} byte limit")
+    # Hand the buffered body back to requests so .content and .json() work as usual
+    response._content = bytes(body)
+
+
+def _validators(response: requests.Response) -> Optional[Dict[str, str]]:
+    """Collect the ETag / Last-Modified validators of a response, if any"""
+    validators = {}
+    if 'ETag' in response.headers:
+        validators['etag'] = response.headers['ETag']
+    if 'Last-Modified' in response.headers:
+        validators['last_modified'] = response.headers['Last-Modified']
+    return validators or None
+
+
+def _conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Request headers that let the server answer 304 if the cached copy is still current"""
+    headers = {}
+    if validators:
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _mark_seen(message: Dict, message_id: str) -> Dict:
+    """Flag a cached API message object as seen if it has the given ID"""
+    if message.get('id') == message_id:
+        message['seen'] = True
+    return message
 
 
 class MailTMClient:
     """Enhanced client for interacting with mail.tm API"""
     
+    PUSH_READ_TIMEOUT = 30  # seconds
+    # Token bucket: sustained requests per second, burst size and how long a 429 slows us down
+    RATE_LIMIT_RATE = 8.0
+    RATE_LIMIT_BURST = 8
+    RATE_LIMIT_BACKOFF = 30  # seconds
+    # Settings read on every request, mirrored into attributes as {config key: (attribute, default)}
+    HOISTED_SETTINGS = {
+        'api_base_url': ('_base_url', 'https://api.mail.tm'),
+        'api_timeout': ('_timeout', 30),
+        'max_messages_display': ('_max_messages', 100),
+        'max_message_bytes': ('_max_message_bytes', 5_000_000),
+    }
+    
     def __init__(self):
         self.session = self._create_session()
         self.token = None
         self.current_account = None
-        self.last_request_time = 0
         self.request_count = 0
+        self._request_counter = itertools.count(1)
+        # (inputs, stats) from the last get_account_stats call, reused while the inputs are unchanged
+        self._last_stats: Optional[Tuple[Tuple, Dict[str, Any]]] = None
+        self._bucket_rate = self.RATE_LIMIT_RATE
+        self._bucket_tokens = float(self.RATE_LIMIT_BURST)
+        self._bucket_last = time.monotonic()
+        self._backoff_until = 0.0
+        self._request_lock = threading.Lock()
+        # In-flight GETs keyed by (endpoint, params); concurrent identical calls share one response
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Issues independent API calls concurrently so their latency overlaps
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mailtm")
+        # Mercure push subscription; mailbox_changed is set whenever the server reports new mail
+        self.mailbox_changed = threading.Event()
+        self._push_thread = None
+        self._push_stop = None
+        self._push_connected = False
+        # In-memory domain list lease as (domains, expires_at monotonic)
+        self._domains_lease: Optional[Tuple[List[Dict], float]] = None
         
+        for key, (attr, default) in self.HOISTED_SETTINGS.items():
+            setattr(self, attr, config.get(key, default))
+        config.register_listener(self._on_config_change)
+        self.warm_cache()
+    
+    def _on_config_change(self, key: str, value: Any):
+        """Refresh the mirrored copy of a hoisted setting"""
+        hoisted = self.HOISTED_SETTINGS.get(key)
+        if hoisted is not None:
+            setattr(self, hoisted[0], value)
+    
     def _create_session(self) -> requests.Session:
         """Create a session with retry logic and proper configuration"""
         session = requests.Session()
@@ -62,24 +241,28 @@ class MailTMClient:
         retry_kwargs = {
             'total': config.get('max_retries', 3),
             'status_forcelist': [429, 500, 502, 503, 504],
-            'backoff_factor': 1
+            'backoff_factor': 1,
+            'respect_retry_after_header': True,
+            # Hand the final error response to _send_request instead of raising MaxRetryError
+            'raise_on_status': False
         }
         
         # Handle urllib3 version compatibility
         try:
-            # Try new parameter name first (urllib3 2.0+)
+            # Try new parameter name first (urllib3 1.26+)
             retry_strategy = Retry(
                 **retry_kwargs,
-                allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"]
+                allowed_methods=RETRY_METHODS
             )
         except TypeError:
             # Fall back to old parameter name (urllib3 < 2.0)
             retry_strategy = Retry(
                 **retry_kwargs,
-                method_whitelist=["HEAD", "GET", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"]
+                method_whitelist=RETRY_METHODS
             )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Keep enough pooled keep-alive connections for concurrent fetches to reuse
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -93,16 +276,69 @@ class MailTMClient:
         return session
     
     def _rate_limit_check(self):
-        """Basic rate limiting to be respectful to the API"""
-        current_time = time.time()
-        if current_time - self.last_request_time < 0.1:  # 100ms between requests
-            time.sleep(0.1)
-        self.last_request_time = current_time
-        self.request_count += 1
+        """Token-bucket rate limiting to be respectful to the API"""
+        with self._request_lock:
+            now = time.monotonic()
+            # Additive increase: recover one request per second per quiet backoff window
+            if self._bucket_rate < self.RATE_LIMIT_RATE and now >= self._backoff_until:
+                self._bucket_rate = min(self.RATE_LIMIT_RATE, self._bucket_rate + 1)
+                self._backoff_until = now + self.RATE_LIMIT_BACKOFF
+            
+            self._bucket_tokens = min(
+                self.RATE_LIMIT_BURST, self._bucket_tokens + (now - self._bucket_last) * self._bucket_rate
+            )
+            self._bucket_last = now
+            # Reserve a token even when none is left, so concurrent callers queue up in order
+            self._bucket_tokens -= 1
+            wait = -self._bucket_tokens / self._bucket_rate if self._bucket_tokens < 0 else 0
+            # Stored under the lock so concurrent callers cannot publish their counts out of order
+            self.request_count = next(self._request_counter)
+        
+        if wait:
+            time.sleep(wait)
+    
+    def _on_rate_limited(self):
+        """Multiplicative decrease: halve the request rate after the server answers 429"""
+        with self._request_lock:
+            self._bucket_rate = max(1.0, self._bucket_rate / 2)
+            self._backoff_until = time.monotonic() + self.RATE_LIMIT_BACKOFF
+            logger.warning("Rate limited by server, slowing down to %g requests/s", self._bucket_rate)
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Make an HTTP request to the mail.tm API, coalescing concurrent identical GETs"""
+        if method != 'GET':
+            return self._send_request(method, endpoint, **kwargs)
+        
+        # Conditional headers are part of the key: a caller without a cached copy must never get a 304
+        key = (endpoint, tuple(sorted((kwargs.get('params') or {}).items())),
+               tuple(sorted((kwargs.get('headers') or {}).items())))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            logger.debug("Joining in-flight request to %s", endpoint)
+            return future.result()
+        
+        try:
+            response = self._send_request(method, endpoint, **kwargs)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def _send_request(self, method: str, endpoint: str, max_bytes: Optional[int] = None,
+                      **kwargs) -> requests.Response:
         """Make an HTTP request to the mail.tm API with enhanced error handling"""
-        url = f"{config.get('api_base_url', 'https://api.mail.tm')}{endpoint}"
+        url = f"{self._base_url}{endpoint}"
+        if max_bytes:
+            kwargs['stream'] = True
         
         # Rate limiting
         self._rate_limit_check()
@@ -112,11 +348,15 @@ class MailTMClient:
             kwargs.setdefault('headers', {})['Authorization'] = f"Bearer {self.token}"
         
         # Set timeout
-        kwargs.setdefault('timeout', config.get('api_timeout', 30))
+        kwargs.setdefault('timeout', self._timeout)
         
         try:
-            logger.debug(f"Making {method} request to {endpoint}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Making %s request to %s", method, endpoint)
             response = self.session.request(method, url, **kwargs)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s %s -> %s (Content-Encoding: %s)", method, endpoint, response.status_code,
+                             response.headers.get('Content-Encoding', 'identity'))
             
             # Handle different HTTP status codes
             if response.status_code == 401:
@@ -126,17 +366,20 @@ class MailTMClient:
             elif response.status_code == 404:
                 raise AccountNotFoundError("Resource not found.")
             elif response.status_code == 429:
+                self._on_rate_limited()
                 raise RateLimitError("Rate limit exceeded. Please wait before trying again.")
             elif response.status_code >= 500:
                 raise NetworkError(f"Server error: {response.status_code}")
             elif response.status_code >= 400:
                 try:
-                    error_data = response.json()
+                    error_data = _json(response)
                     error_msg = error_data.get('message', 'Unknown error')
                     raise APIError(f"API Error: {error_msg}", response.status_code, error_data)
                 except (json.JSONDecodeError, KeyError):
                     raise APIError(f"API Error ({response.status_code}): {response.text}", response.status_code)
             
+            if max_bytes:
+                _read_capped(response, max_bytes)
             return response
             
         except requests.exceptions.Timeout:
@@ -157,11 +400,21 @@ class MailTMClient:
                 return cached_domains
         
         try:
-            response = self._make_request('GET', '/domains')
-            response_data = response.json()
+            stale_domains, validators = cache.peek(cache_key) if use_cache else (None, None)
+            response = self._make_request('GET', '/domains', headers=_conditional_headers(validators))
+            if response.status_code == 304:
+                if stale_domains is not None:
+                    cache.touch(cache_key, _ttl_from_response(response, 3600))
+                    logger.debug("Domains not modified, reusing cached copy")
+                    return stale_domains
+                # The cached copy was dropped while revalidating; fetch the full body instead
+                response = self._make_request('GET', '/domains')
+            
+            response_data = _json(response)
             
             # Debug: Log the actual response structure
-            logger.debug(f"Domains API response: {response_data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Domains API response: %s", response_data)
             
             # Handle different possible response structures
             if 'hydra:member' in response_data:
@@ -176,20 +429,38 @@ class MailTMClient:
             
             # Ensure domains is a list
             if not isinstance(domains, list):
-                logger.error(f"Unexpected domains response format: {type(domains)}")
+                logger.error("Unexpected domains response format: %s", type(domains))
                 raise ValueError(f"Invalid domains response format: {type(domains)}")
             
             # Cache the result
             if use_cache:
-                cache.set(cache_key, domains, ttl=3600)  # Cache for 1 hour
+                cache.set(cache_key, domains, ttl=_ttl_from_response(response, 3600),
+                          validators=_validators(response))
             
-            logger.info(f"Retrieved {len(domains)} domains")
+            logger.info("Retrieved %s domains", len(domains))
             return domains
             
         except Exception as e:
-            logger.error(f"Failed to get domains: {e}")
+            logger.error("Failed to get domains: %s", e)
             raise
     
+    def warm_cache(self):
+        """Load the domain list persisted by an earlier run into memory so first use skips the network"""
+        remaining = cache.ttl("domains")
+        if remaining:
+            self._domains_lease = (cache.get("domains"), time.monotonic() + remaining)
+            logger.debug("Warmed domain list from the cache file")
+    
+    def get_domains_cached(self, ttl: int = 3600) -> List[Dict]:
+        """Get available domains, reusing an in-memory copy for up to ttl seconds"""
+        lease = self._domains_lease
+        if lease is not None and time.monotonic() < lease[1]:
+            return lease[0]
+        
+        domains = self.get_domains()
+        self._domains_lease = (domains, time.monotonic() + ttl)
+        return domains
+    
     def create_account(self, address: str, password: str) -> MailAccount:
         """Create a new mail.tm account with validation"""
         # Validate input
@@ -204,30 +475,18 @@ class MailTMClient:
                 "password": password
             }
             
-            logger.info(f"Creating account: {address}")
+            logger.info("Creating account: %s", address)
             response = self._make_request('POST', '/accounts', json=data)
-            account_data = response.json()
-            
-            account = MailAccount(
-                id=account_data['id'],
-                address=account_data['address'],
-                quota=account_data['quota'],
-                used=account_data['used'],
-                is_disabled=account_data['isDisabled'],
-                is_deleted=account_data['isDeleted'],
-                created_at=account_data['createdAt'],
-                updated_at=account_data['updatedAt']
-            )
+            account_data = _json(response)
             
-            logger.info(f"Account created successfully: {account.address}")
+            account = MailAccount.from_dict(account_data)
             
-            # Clear domain cache since we might have used one
-            cache.delete("domains")
+            logger.info("Account created successfully: %s", account.address)
             
             return account
             
         except Exception as e:
-            logger.error(f"Failed to create account: {e}")
+            logger.error("Failed to create account: %s", e)
             if "already exists" in str(e).lower():
                 raise AccountCreationError(f"Account {address} already exists")
             raise
@@ -240,70 +499,135 @@ class MailTMClient:
                 "password": password
             }
             
-            logger.info(f"Logging in: {address}")
+            logger.info("Logging in: %s", address)
             response = self._make_request('POST', '/token', json=data)
-            token_data = response.json()
+            token_data = _json(response)
             
             self.token = token_data['token']
             
             # Get account info
             account_response = self._make_request('GET', '/me')
-            account_data = account_response.json()
-            
-            account = MailAccount(
-                id=account_data['id'],
-                address=account_data['address'],
-                quota=account_data['quota'],
-                used=account_data['used'],
-                is_disabled=account_data['isDisabled'],
-                is_deleted=account_data['isDeleted'],
-                created_at=account_data['createdAt'],
-                updated_at=account_data['updatedAt']
-            )
+            account_data = _json(account_response)
+            
+            account = MailAccount.from_dict(account_data)
             
             self.current_account = account
-            logger.info(f"Login successful: {account.address}")
+            logger.info("Login successful: %s", account.address)
             
             return account, self.token
             
         except Exception as e:
-            logger.error(f"Login failed for {address}: {e}")
+            logger.error("Login failed for %s: %s", address, e)
             if "invalid" in str(e).lower() or "credentials" in str(e).lower():
                 raise InvalidCredentialsError("Invalid email or password")
             raise
     
+    def start_push_subscription(self):
+        """Subscribe to Mercure updates for the current account on a background thread"""
+        self._stop_push_subscription()
+        if not config.get('push_updates', True) or not self.current_account:
+            return
+        
+        self._push_stop = threading.Event()
+        self._push_thread = threading.Thread(
+            target=self._push_loop, args=(self._push_stop, self.current_account.id, self.token),
+            name="mailtm-push", daemon=True
+        )
+        self._push_thread.start()
+    
+    def _stop_push_subscription(self):
+        """Stop the Mercure subscription; its thread exits at the next event or read timeout"""
+        if self._push_stop is not None:
+            self._push_stop.set()
+            self._push_stop = None
+        self._push_connected = False
+    
+    def push_active(self) -> bool:
+        """Check if the Mercure stream is currently connected"""
+        return self._push_connected
+    
+    def _push_loop(self, stop: threading.Event, account_id: str, token: str):
+        """Read Mercure server-sent events until stopped, reconnecting with backoff"""
+        url = config.get('mercure_url', 'https://mercure.mail.tm/.well-known/mercure')
+        headers = {'Authorization': f"Bearer {token}", 'Accept': 'text/event-stream'}
+        # Idle streams are re-opened after this many seconds so a stopped subscription can exit
+        timeout = (self._timeout, self.PUSH_READ_TIMEOUT)
+        backoff = 1
+        
+        while not stop.is_set():
+            try:
+                with self.session.get(url, params={'topic': f"/accounts/{account_id}"}, headers=headers,
+                                      stream=True, timeout=timeout) as response:
+                    response.raise_for_status()
+                    if stop.is_set():
+                        break
+                    self._push_connected = True
+                    backoff = 1
+                    logger.debug("Mercure subscription established")
+                    
+                    # Events are small and sparse; read unbuffered so each one is seen immediately
+                    for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+                        if stop.is_set():
+                            break
+                        if line and line.startswith('data:'):
+                            self._on_push_event(account_id)
+            except requests.exceptions.ConnectionError as e:
+                # Read timeouts on an idle stream surface here; reconnect right away
+                if not stop.is_set() and 'timed out' not in str(e).lower():
+                    logger.debug("Mercure subscription dropped: %s", e)
+                    stop.wait(backoff)
+                    backoff = min(backoff * 2, 60)
+            except Exception as e:
+                if not stop.is_set():
+                    logger.debug("Mercure subscription dropped: %s", e)
+                    stop.wait(backoff)
+                    backoff = min(backoff * 2, 60)
+            finally:
+                if not stop.is_set():
+                    self._push_connected = False
+    
+    def _on_push_event(self, account_id: str):
+        """Invalidate the cached mailbox and signal listeners after a push event"""
+        cache.delete_prefix(f"messages_{account_id}_")
+        self.mailbox_changed.set()
+    
     def delete_account(self) -> bool:
         """Delete the current account with confirmation"""
         if not self.current_account:
             raise AuthenticationError("No account logged in")
         
         try:
-            logger.warning(f"Deleting account: {self.current_account.address}")
+            logger.warning("Deleting account: %s", self.current_account.address)
             response = self._make_request('DELETE', f'/accounts/{self.current_account.id}')
             
             if response.status_code == 204:
-                logger.info(f"Account {self.current_account.address} deleted successfully")
+                logger.info("Account %s deleted successfully", self.current_account.address)
                 return True
             else:
                 raise APIError(f"Failed to delete account: {response.status_code}")
                 
         except Exception as e:
-            logger.error(f"Failed to delete account: {e}")
+            logger.error("Failed to delete account: %s", e)
             raise
     
-    def get_messages(self, page: int = 1, limit: int = None, use_cache: bool = True) -> List[MailMessage]:
-        """Get messages from the current account's mailbox with caching"""
+    def get_messages(self, page: int = 1, limit: int = None, use_cache: bool = True,
+                     revalidate: bool = False) -> List[MailMessage]:
+        """Get messages from the current account's mailbox with caching
+
+        With revalidate=True a fresh cached page is not trusted as is; it is checked
+        against the server with a conditional request instead.
+        """
         if not self.current_account:
             raise AuthenticationError("No account logged in")
         
-        limit = limit or config.get('max_messages_display', 100)
+        limit = limit or self._max_messages
         cache_key = f"messages_{self.current_account.id}_{page}_{limit}"
         
-        if use_cache:
+        if use_cache and not revalidate:
             cached_messages = cache.get(cache_key)
             if cached_messages:
                 logger.debug("Using cached messages")
-                return cached_messages
+                return [MailMessage.from_dict(msg_data) for msg_data in cached_messages]
         
         try:
             params = {
@@ -311,11 +635,22 @@ class MailTMClient:
                 'limit': limit
             }
             
-            response = self._make_request('GET', '/messages', params=params)
-            response_data = response.json()
+            stale_messages, validators = cache.peek(cache_key) if use_cache else (None, None)
+            response = self._make_request('GET', '/messages', params=params,
+                                          headers=_conditional_headers(validators))
+            if response.status_code == 304:
+                if stale_messages is not None:
+                    cache.touch(cache_key, _ttl_from_response(response, 300))
+                    logger.debug("Messages not modified, reusing cached page")
+                    return [MailMessage.from_dict(msg_data) for msg_data in stale_messages]
+                # The cached page was dropped while revalidating; fetch the full body instead
+                response = self._make_request('GET', '/messages', params=params)
+            
+            response_data = _json(response)
             
             # Debug: Log the actual response structure
-            logger.debug(f"Messages API response: {response_data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Messages API response: %s", response_data)
             
             # Handle different possible response structures
             if 'hydra:member' in response_data:
@@ -330,44 +665,33 @@ class MailTMClient:
             
             # Ensure messages_data is a list
             if not isinstance(messages_data, list):
-                logger.error(f"Unexpected messages response format: {type(messages_data)}")
+                logger.error("Unexpected messages response format: %s", type(messages_data))
                 raise ValueError(f"Invalid messages response format: {type(messages_data)}")
             
             messages = []
+            valid_data = []
             for msg_data in messages_data:
+                if not isinstance(msg_data, dict):
+                    logger.warning("Skipping invalid message data: %s", msg_data)
+                    continue
                 try:
-                    # Handle different message structures
-                    if isinstance(msg_data, dict):
-                        message = MailMessage(
-                            id=msg_data.get('id', ''),
-                            from_address=msg_data.get('from', {}).get('address', '') if isinstance(msg_data.get('from'), dict) else str(msg_data.get('from', '')),
-                            to_address=msg_data.get('to', [{}])[0].get('address', '') if msg_data.get('to') and isinstance(msg_data.get('to'), list) else '',
-                            subject=msg_data.get('subject', ''),
-                            intro=msg_data.get('intro', ''),
-                            seen=msg_data.get('seen', False),
-                            is_deleted=msg_data.get('isDeleted', False),
-                            has_attachments=msg_data.get('hasAttachments', False),
-                            size=msg_data.get('size', 0),
-                            download_url=msg_data.get('downloadUrl', ''),
-                            created_at=msg_data.get('createdAt', ''),
-                            updated_at=msg_data.get('updatedAt', '')
-                        )
-                        messages.append(message)
-                    else:
-                        logger.warning(f"Skipping invalid message data: {msg_data}")
+                    messages.append(MailMessage.from_dict(msg_data))
                 except Exception as e:
-                    logger.warning(f"Error processing message data: {e}, skipping...")
+                    logger.warning("Error processing message data: %s, skipping...", e)
                     continue
+                # Only entries that parsed are cached, so cache hits can rebuild them safely
+                valid_data.append(msg_data)
             
-            # Cache the result
+            # Cache the raw API objects; they survive the round-trip through the cache file
             if use_cache:
-                cache.set(cache_key, messages, ttl=300)  # Cache for 5 minutes
+                cache.set(cache_key, valid_data, ttl=_ttl_from_response(response, 300),
+                          validators=_validators(response))
             
-            logger.debug(f"Retrieved {len(messages)} messages")
+            logger.debug("Retrieved %s messages", len(messages))
             return messages
             
         except Exception as e:
-            logger.error(f"Failed to get messages: {e}")
+            logger.error("Failed to get messages: %s", e)
             raise
     
     def get_message(self, message_id: str, use_cache: bool = True) -> Dict:
@@ -375,7 +699,7 @@ class MailTMClient:
         if not self.current_account:
             raise AuthenticationError("No account logged in")
         
-        cache_key = f"message_{message_id}"
+        cache_key = f"message_{self.current_account.id}_{message_id}"
         
         if use_cache:
             cached_message = cache.get(cache_key)
@@ -384,19 +708,46 @@ class MailTMClient:
                 return cached_message
         
         try:
-            response = self._make_request('GET', f'/messages/{message_id}')
-            message_data = response.json()
+            response = self._make_request('GET', f'/messages/{message_id}',
+                                          max_bytes=self._max_message_bytes)
+            message_data = _json(response)
             
             # Cache the result
             if use_cache:
-                cache.set(cache_key, message_data, ttl=1800)  # Cache for 30 minutes
+                cache.set(cache_key, message_data, ttl=_ttl_from_response(response, 1800))
             
             return message_data
             
         except Exception as e:
-            logger.error(f"Failed to get message {message_id}: {e}")
+            logger.error("Failed to get message %s: %s", message_id, e)
             raise
     
+    def prefetch_messages(self, message_ids: List[str]) -> int:
+        """Fetch uncached messages concurrently into the cache and return how many were fetched"""
+        if not self.current_account:
+            raise AuthenticationError("No account logged in")
+        
+        # Bodies are keyed by account so logout() can purge them with one prefix
+        key_prefix = f"message_{self.current_account.id}_"
+        missing = [message_id for message_id in message_ids if cache.get(key_prefix + message_id) is None]
+        max_bytes = self._max_message_bytes
+        
+        def fetch(message_id):
+            try:
+                return message_id, self._make_request('GET', f'/messages/{message_id}', max_bytes=max_bytes)
+            except Exception as e:
+                logger.debug("Failed to prefetch message %s: %s", message_id, e)
+                return message_id, None
+        
+        fetched = 0
+        for message_id, response in self._executor.map(fetch, missing):
+            if response is not None:
+                cache.set(key_prefix + message_id, _json(response), ttl=_ttl_from_response(response, 1800))
+                fetched += 1
+        
+        logger.debug("Prefetched %s of %s messages", fetched, len(message_ids))
+        return fetched
+    
     def mark_message_seen(self, message_id: str) -> bool:
         """Mark a message as seen"""
         if not self.current_account:
@@ -407,18 +758,21 @@ class MailTMClient:
             response = self._make_request('PATCH', f'/messages/{message_id}', json=data)
             
             if response.status_code == 200:
-                logger.debug(f"Message {message_id} marked as seen")
+                logger.debug("Message %s marked as seen", message_id)
                 
-                # Clear message cache
-                cache.delete(f"message_{message_id}")
-                cache.delete(f"messages_{self.current_account.id}_1_50")  # Clear first page cache
+                # Patch cached mailbox pages in place so the next list read needs no round-trip
+                cache.delete(f"message_{self.current_account.id}_{message_id}")
+                cache.update_prefix(
+                    f"messages_{self.current_account.id}_",
+                    lambda messages: [_mark_seen(m, message_id) for m in messages]
+                )
                 
                 return True
             else:
                 raise APIError(f"Failed to mark message as seen: {response.status_code}")
                 
         except Exception as e:
-            logger.error(f"Failed to mark message as seen: {e}")
+            logger.error("Failed to mark message as seen: %s", e)
             raise
     
     def delete_message(self, message_id: str) -> bool:
@@ -430,55 +784,80 @@ class MailTMClient:
             response = self._make_request('DELETE', f'/messages/{message_id}')
             
             if response.status_code == 204:
-                logger.debug(f"Message {message_id} deleted")
+                logger.debug("Message %s deleted", message_id)
                 
                 # Clear caches
-                cache.delete(f"message_{message_id}")
-                cache.delete(f"messages_{self.current_account.id}_1_50")
+                cache.delete(f"message_{self.current_account.id}_{message_id}")
+                cache.delete_prefix(f"messages_{self.current_account.id}_")
                 
                 return True
             else:
                 raise APIError(f"Failed to delete message: {response.status_code}")
                 
         except Exception as e:
-            logger.error(f"Failed to delete message: {e}")
+            logger.error("Failed to delete message: %s", e)
             raise
     
-    def refresh_mailbox(self) -> List[MailMessage]:
-        """Refresh mailbox and get latest messages"""
-        # Clear message cache to force fresh data
-        if self.current_account:
-            cache.delete(f"messages_{self.current_account.id}_1_50")
+    def get_message_pages(self, pages: int, use_cache: bool = True,
+                          revalidate: bool = False) -> List[MailMessage]:
+        """Get the first pages of the mailbox, fetching the pages concurrently"""
+        if pages <= 1:
+            return self.get_messages(use_cache=use_cache, revalidate=revalidate)
         
-        return self.get_messages(use_cache=False)
+        results = self._executor.map(
+            lambda page: self.get_messages(page=page, use_cache=use_cache, revalidate=revalidate),
+            range(1, pages + 1)
+        )
+        return [message for page_messages in results for message in page_messages]
+    
+    def refresh_mailbox(self, pages: int = 1) -> List[MailMessage]:
+        """Refresh mailbox and get latest messages"""
+        # Check every cached page with the server; unchanged pages cost a bodyless 304
+        return self.get_message_pages(pages, revalidate=True)
     
     def get_account_stats(self) -> Dict[str, Any]:
         """Get account statistics"""
         if not self.current_account:
             raise AuthenticationError("No account logged in")
         
-        return {
-            'address': self.current_account.address,
-            'quota_used': self.current_account.used,
-            'quota_total': self.current_account.quota,
-            'quota_percentage': round((self.current_account.used / self.current_account.quota) * 100, 2),
-            'created_at': self.current_account.created_at,
-            'last_updated': self.current_account.updated_at,
+        account = self.current_account
+        key = (account.id, account.used, account.quota, account.updated_at, self.request_count)
+        if self._last_stats and self._last_stats[0] == key:
+            return dict(self._last_stats[1])
+        
+        stats = {
+            'address': account.address,
+            'quota_used': account.used,
+            'quota_total': account.quota,
+            # Freshly provisioned accounts can report a zero quota
+            'quota_percentage': round((account.used / account.quota) * 100, 2) if account.quota else 0.0,
+            'created_at': account.created_at,
+            'last_updated': account.updated_at,
             'request_count': self.request_count
         }
+        self._last_stats = (key, stats)
+        # Callers get their own copy so one caller's edits never leak into another's stats
+        return dict(stats)
     
     def logout(self):
-        """Logout and clear session"""
-        if self.current_account:
-            logger.info(f"Logging out: {self.current_account.address}")
+        """Logout and clear account state; the HTTP session stays open for the next login"""
+        account = self.current_account
+        self._stop_push_subscription()
+        
+        # Clear sensitive caches
+        if account:
+            logger.info("Logging out: %s", account.address)
+            cache.delete_prefix(f"messages_{account.id}_")
+            cache.delete_prefix(f"message_{account.id}_")
         
         self.token = None
         self.current_account = None
+    
+    def close(self):
+        """Release the HTTP session, its pooled connections and the worker threads"""
+        self._stop_push_subscription()
+        self._executor.shutdown(wait=False)
         self.session.close()
-        
-        # Clear sensitive caches
-        if self.current_account:
-            cache.delete(f"messages_{self.current_account.id}_1_50")
     
     def is_logged_in(self) -> bool:
         """Check if currently logged in"""
@@ -491,4 +870,5 @@ class MailTMClient:
     def clear_cache(self):
         """Clear all cached data"""
         cache.clear()
+        self._domains_lease = None
         logger.info("Cache cleared")
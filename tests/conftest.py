@@ -0,0 +1,18 @@
+"""
+Shared pytest setup: keeps the app's config, cache and log files out of the real home directory
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Must run before the app modules are imported, since they read ~/.pryvon at import time
+_home = tempfile.mkdtemp(prefix="pryvon-tests-")
+atexit.register(shutil.rmtree, _home, ignore_errors=True)
+os.environ["HOME"] = _home
+os.environ["RICH_TRACEBACK"] = "0"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
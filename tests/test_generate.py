@@ -0,0 +1,37 @@
+"""
+Tests for PryvonTempMailApp.generate_random_string
+"""
+
+import string
+
+import pytest
+
+from console_app import PryvonTempMailApp
+
+ALPHABET = set(string.ascii_lowercase + string.digits)
+SAMPLES = 10_000
+
+
+@pytest.fixture(scope="module")
+def app():
+    """An app instance without the client, threads and signal handlers __init__ sets up"""
+    return PryvonTempMailApp.__new__(PryvonTempMailApp)
+
+
+@pytest.mark.parametrize("length", [1, 8, 12, 32])
+def test_length(app, length):
+    assert len(app.generate_random_string(length)) == length
+
+
+def test_default_length(app):
+    assert len(app.generate_random_string()) == 8
+
+
+def test_charset(app):
+    for _ in range(SAMPLES):
+        assert set(app.generate_random_string()) <= ALPHABET
+
+
+def test_uniqueness(app):
+    samples = {app.generate_random_string() for _ in range(SAMPLES)}
+    assert len(samples) == SAMPLES